@@ -2,30 +2,21 @@
 DeepTrust Analysis Service
 Handles file uploads and orchestrates deepfake detection.
 """
-from fastapi import FastAPI, Depends, Header
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import Depends, Header
 from sqlalchemy.orm import Session
-import os
+import logging
 
+from shared.app_factory import create_app
 from shared.database.base import get_db, check_db_connection
 from shared.schemas import HealthResponse
+from shared.utils import start_queue_logging, stop_queue_logging
 from app.routes import upload
+from app.services.storage_service import storage_service, storage_executor
 
-# Initialize app
-app = FastAPI(
-    title="DeepTrust Analysis Service",
-    description="File upload and deepfake detection orchestration",
-    version="1.0.0"
-)
+logger = logging.getLogger(__name__)
 
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=os.getenv("ALLOWED_ORIGINS", "*").split(","),
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Initialize app
+app = create_app("Analysis Service", "File upload and deepfake detection orchestration")
 
 # Include routers
 app.include_router(upload.router)
@@ -33,11 +24,25 @@ app.include_router(upload.router)
 
 @app.on_event("startup")
 async def startup():
-    print("🚀 Starting Analysis Service...")
+    start_queue_logging()
+    logger.info("🚀 Starting Analysis Service...")
     if check_db_connection():
-        print("✅ Database connected")
+        logger.info("✅ Database connected")
     else:
-        print("⚠️  Database connection check failed")
+        logger.warning("⚠️  Database connection check failed")
+    
+    # Pay the bucket round trip here rather than on the first upload
+    try:
+        storage_service._ensure_bucket_exists()
+        logger.info("✅ Storage ready")
+    except Exception as e:
+        logger.warning("⚠️  Storage warm-up failed: %s", e)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    storage_executor.shutdown(wait=True)
+    stop_queue_logging()
 
 
 @app.get("/", response_model=dict)
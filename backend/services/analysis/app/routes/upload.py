@@ -2,103 +2,103 @@
 File upload endpoints.
 Handles media uploads and creates analysis records.
 """
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Header
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import Optional
+import asyncio
+import functools
+import logging
 import uuid
 
-from shared.database.base import get_db
+from shared.auth import get_current_user
+from shared.database.base import get_db, SessionLocal
 from shared.models import Analysis, AnalysisStatus, User
-from shared.utils import verify_token
-from app.services.storage_service import storage_service
+from app.services.storage_service import storage_service, storage_executor
 from app.services.file_validator import validate_upload_file, get_file_extension
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/upload", tags=["Upload"])
 
 
-async def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-) -> User:
-    """Extract and validate user from Authorization header."""
-    if not authorization:
-        raise HTTPException(
-            status_code=401,
-            detail="Missing authorization header",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
-    
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid authorization format",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
-    
-    token = authorization.replace("Bearer ", "")
+def _persist_analysis(analysis_id: uuid.UUID, user_id: uuid.UUID, file_name: str,
+                      object_name: str, file_size: int, mime_type: str, uploaded_at: datetime):
+    """
+    Insert the Analysis row for a completed upload.
     
+    Runs as a background task after the response is sent, so it opens
+    its own session rather than reusing the request's.
+    """
+    db = SessionLocal()
     try:
-        payload = verify_token(token)
-        user_id = payload.get("user_id")
-        
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user or not user.is_active:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        return user
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail="Token validation failed")
+        db.add(Analysis(
+            id=analysis_id,
+            user_id=user_id,
+            file_name=file_name,
+            file_path=object_name,
+            file_size=file_size,
+            mime_type=mime_type,
+            status=AnalysisStatus.PENDING,
+            file_metadata={
+                "original_filename": file_name,
+                "upload_timestamp": uploaded_at.isoformat()
+            },
+            created_at=uploaded_at
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        # The object is already in MinIO; its key carries the user and analysis IDs
+        logger.exception("❌ Failed to record analysis %s for %s", analysis_id, object_name)
+    finally:
+        db.close()
 
 
 @router.post("/")
 async def upload_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Upload media file for deepfake analysis."""
-    content, mime_type, file_size = await validate_upload_file(file)
+    stream, mime_type, file_size = await validate_upload_file(file)
     
+    analysis_id = uuid.uuid4()
     file_extension = get_file_extension(mime_type)
-    object_name = f"uploads/{current_user.id}/{uuid.uuid4()}{file_extension}"
+    object_name = f"uploads/{current_user.id}/{analysis_id}{file_extension}"
     
     try:
-        storage_service.upload_file(content, object_name, mime_type)
+        # minio-py is blocking; keep the transfer off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            storage_executor,
+            functools.partial(
+                storage_service.upload_stream, stream, file_size, object_name, mime_type
+            )
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Storage failed: {str(e)}")
     
-    analysis = Analysis(
-        user_id=current_user.id,
-        file_name=file.filename,
-        file_path=object_name,
-        file_size=file_size,
-        mime_type=mime_type,
-        status=AnalysisStatus.PENDING,
-        file_metadata={
-            "original_filename": file.filename,
-            "upload_timestamp": datetime.utcnow().isoformat()
-        }
+    # The row is written after the response goes out
+    background_tasks.add_task(
+        _persist_analysis,
+        analysis_id,
+        current_user.id,
+        file.filename,
+        object_name,
+        file_size,
+        mime_type,
+        datetime.utcnow()
     )
     
-    db.add(analysis)
-    db.commit()
-    db.refresh(analysis)
-    
-    print(f"✅ Uploaded: {file.filename} -> {object_name} (ID: {analysis.id})")
+    logger.info("✅ Uploaded: %s -> %s (ID: %s)", file.filename, object_name, analysis_id)
     
     return {
-        "analysis_id": str(analysis.id),
-        "status": analysis.status.value,
-        "file_name": analysis.file_name,
-        "file_size": analysis.file_size,
-        "mime_type": analysis.mime_type,
+        "analysis_id": str(analysis_id),
+        "status": AnalysisStatus.PENDING.value,
+        "file_name": file.filename,
+        "file_size": file_size,
+        "mime_type": mime_type,
         "message": "File uploaded successfully"
     }
 
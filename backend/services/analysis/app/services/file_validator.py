@@ -5,45 +5,61 @@ Validates file type, size, and content.
 from fastapi import UploadFile, HTTPException
 import magic
 import os
-from typing import Tuple
+from types import MappingProxyType
+from typing import Tuple, BinaryIO
 
 # Configuration
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 100 * 1024 * 1024))  # 100MB default
-ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/jpg", "image/webp"}
-ALLOWED_VIDEO_TYPES = {"video/mp4", "video/mpeg", "video/quicktime", "video/x-msvideo"}
+MIME_SNIFF_BYTES = 4096  # libmagic only needs the container header
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/jpg", "image/webp"})
+ALLOWED_VIDEO_TYPES = frozenset({"video/mp4", "video/mpeg", "video/quicktime", "video/x-msvideo"})
 ALLOWED_TYPES = ALLOWED_IMAGE_TYPES | ALLOWED_VIDEO_TYPES
 
+_MIME_TO_EXT = MappingProxyType({
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "video/mp4": ".mp4",
+    "video/mpeg": ".mpeg",
+    "video/quicktime": ".mov",
+    "video/x-msvideo": ".avi"
+})
 
-async def validate_upload_file(file: UploadFile) -> Tuple[bytes, str, int]:
+# Opened once; magic.from_buffer() reloads the magic database on every call
+_MAGIC = magic.Magic(mime=True)
+
+
+async def validate_upload_file(file: UploadFile) -> Tuple[BinaryIO, str, int]:
     """
-    Validate uploaded file.
+    Validate uploaded file without reading it into memory.
     
     Args:
         file: FastAPI UploadFile object
         
     Returns:
-        Tuple of (file_content, mime_type, file_size)
+        Tuple of (file_stream, mime_type, file_size). The stream is the
+        upload's underlying spooled file, rewound to the start.
         
     Raises:
         HTTPException: If validation fails
     """
-    # Read file content
-    content = await file.read()
-    file_size = len(content)
+    # Check file size before touching the content
+    file_size = _get_file_size(file)
     
-    # Check file size
     if file_size == 0:
         raise HTTPException(status_code=400, detail="Empty file")
     
     if file_size > MAX_FILE_SIZE:
         max_mb = MAX_FILE_SIZE / (1024 * 1024)
         raise HTTPException(
-            status_code=400,
+            status_code=413,
             detail=f"File too large. Maximum size: {max_mb}MB"
         )
     
-    # Detect MIME type from content (not extension)
-    mime_type = magic.from_buffer(content, mime=True)
+    # Detect MIME type from content (not extension), header only
+    head = await file.read(MIME_SNIFF_BYTES)
+    mime_type = _MAGIC.from_buffer(head)
     
     # Validate MIME type
     if mime_type not in ALLOWED_TYPES:
@@ -52,22 +68,26 @@ async def validate_upload_file(file: UploadFile) -> Tuple[bytes, str, int]:
             detail=f"Invalid file type: {mime_type}. Allowed: images and videos only"
         )
     
-    return content, mime_type, file_size
+    await file.seek(0)
+    return file.file, mime_type, file_size
+
+
+def _get_file_size(file: UploadFile) -> int:
+    """Size reported by the multipart parser, or measured on the spooled file"""
+    if file.size is not None:
+        return file.size
+    
+    stream = file.file
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
 
 
 def get_file_extension(mime_type: str) -> str:
     """Get file extension from MIME type"""
-    mime_to_ext = {
-        "image/jpeg": ".jpg",
-        "image/jpg": ".jpg",
-        "image/png": ".png",
-        "image/webp": ".webp",
-        "video/mp4": ".mp4",
-        "video/mpeg": ".mpeg",
-        "video/quicktime": ".mov",
-        "video/x-msvideo": ".avi"
-    }
-    return mime_to_ext.get(mime_type, ".bin")
+    return _MIME_TO_EXT.get(mime_type, ".bin")
 
 
 def is_image(mime_type: str) -> bool:
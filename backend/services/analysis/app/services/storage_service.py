@@ -4,10 +4,12 @@ Handles file uploads, downloads, and URL generation.
 """
 from minio import Minio
 from minio.error import S3Error
+from concurrent.futures import ThreadPoolExecutor
 import os
+import io
 import logging
-from io import BytesIO
 from datetime import timedelta
+from typing import BinaryIO
 
 logger = logging.getLogger(__name__)
 
@@ -17,30 +19,26 @@ MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "deeptrust")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "deeptrust_dev_password")
 MINIO_BUCKET = os.getenv("MINIO_BUCKET", "deepfake-uploads")
 MINIO_SECURE = os.getenv("MINIO_SECURE", "false").lower() == "true"
+MULTIPART_PART_SIZE = 5 * 1024 * 1024  # minio-py minimum, used when length is unknown
+STORAGE_MAX_WORKERS = int(os.getenv("STORAGE_MAX_WORKERS", "16"))
 
 
 class StorageService:
     """MinIO S3 storage operations"""
     
     def __init__(self):
-        self._client = None
+        # Constructing the client does no I/O, so do it up front
+        self.client = Minio(
+            MINIO_ENDPOINT,
+            access_key=MINIO_ACCESS_KEY,
+            secret_key=MINIO_SECRET_KEY,
+            secure=MINIO_SECURE
+        )
         self._bucket_initialized = False
-    
-    @property
-    def client(self):
-        """Lazy initialize MinIO client"""
-        if self._client is None:
-            self._client = Minio(
-                MINIO_ENDPOINT,
-                access_key=MINIO_ACCESS_KEY,
-                secret_key=MINIO_SECRET_KEY,
-                secure=MINIO_SECURE
-            )
-            logger.info(f"✅ MinIO client initialized: {MINIO_ENDPOINT}")
-        return self._client
+        logger.info(f"✅ MinIO client initialized: {MINIO_ENDPOINT}")
     
     def _ensure_bucket_exists(self):
-        """Create bucket if it doesn't exist (called on first use)"""
+        """Create bucket if it doesn't exist (called at startup, and on use as a fallback)"""
         if self._bucket_initialized:
             return
             
@@ -55,17 +53,19 @@ class StorageService:
             logger.error(f"❌ Bucket initialization failed: {e}")
             raise
     
-    def upload_file(
+    def upload_stream(
         self,
-        file_data: bytes,
+        data: BinaryIO,
+        length: int,
         object_name: str,
         content_type: str = "application/octet-stream"
     ) -> str:
         """
-        Upload file to MinIO.
+        Stream a file-like object to MinIO.
         
         Args:
-            file_data: File content as bytes
+            data: Readable binary stream
+            length: Number of bytes to send, or -1 if unknown (multipart)
             object_name: S3 object key (path in bucket)
             content_type: MIME type
             
@@ -75,24 +75,42 @@ class StorageService:
         self._ensure_bucket_exists()
         
         try:
-            file_stream = BytesIO(file_data)
-            file_size = len(file_data)
-            
             self.client.put_object(
                 MINIO_BUCKET,
                 object_name,
-                file_stream,
-                file_size,
-                content_type=content_type
+                data,
+                length,
+                content_type=content_type,
+                part_size=0 if length >= 0 else MULTIPART_PART_SIZE
             )
             
-            logger.info(f"✅ Uploaded: {object_name} ({file_size} bytes)")
+            logger.info(f"✅ Uploaded: {object_name} ({length} bytes)")
             return object_name
             
         except S3Error as e:
             logger.error(f"❌ Upload failed: {e}")
             raise
     
+    def upload_file(
+        self,
+        file_data: bytes,
+        object_name: str,
+        content_type: str = "application/octet-stream"
+    ) -> str:
+        """
+        Upload in-memory file content to MinIO.
+        
+        Args:
+            file_data: File content as bytes
+            object_name: S3 object key (path in bucket)
+            content_type: MIME type
+            
+        Returns:
+            Object path in bucket
+        """
+        # BytesIO over bytes shares the buffer until written to; no copy
+        return self.upload_stream(io.BytesIO(file_data), len(file_data), object_name, content_type)
+    
     def download_file(self, object_name: str) -> bytes:
         """
         Download file from MinIO.
@@ -174,4 +192,11 @@ class StorageService:
 
 
 # Singleton instance
-storage_service = StorageService()
\ No newline at end of file
+storage_service = StorageService()
+
+# Blocking MinIO calls run here so slow transfers don't tie up the
+# default thread pool that sync DB dependencies share
+storage_executor = ThreadPoolExecutor(
+    max_workers=STORAGE_MAX_WORKERS,
+    thread_name_prefix="storage"
+)
\ No newline at end of file
@@ -2,72 +2,125 @@
 DeepTrust Authentication Service
 Production-grade implementation using shared modules.
 """
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import bindparam, select, update, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from datetime import datetime
-from typing import List
+from typing import List, Type
+import json
+import logging
 import os
 
+from shared.app_factory import create_app
+from shared.auth import get_current_user
 from shared.database.base import get_db, init_db, check_db_connection
-from shared.models import User, UserRole
+from shared.models import User, UserRole, ROLE_VALUES
 from shared.schemas import (
     UserRegister, UserResponse, Token, UserUpdate,
-    PasswordChange, MessageResponse, HealthResponse
+    PasswordChange, MessageResponse, HealthResponse,
+    USER_RESPONSE_ADAPTER, USER_LIST_ADAPTER, TOKEN_ADAPTER
 )
-from shared.utils import hash_password, verify_password, create_access_token, verify_token
-
-app = FastAPI(
-    title="DeepTrust Auth Service",
-    description="Enterprise authentication and user management",
-    version="1.0.0"
+from shared.utils import (
+    ahash_password, averify_password, needs_rehash, create_access_token, token_cache,
+    start_queue_logging, stop_queue_logging
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=os.getenv("ALLOWED_ORIGINS", "*").split(","),
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+logger = logging.getLogger(__name__)
+
+app = create_app("Auth Service", "Enterprise authentication and user management")
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+LAST_LOGIN_UPDATE_INTERVAL = int(os.getenv("LAST_LOGIN_UPDATE_INTERVAL", "300"))  # seconds
+
+# Columns needed to build a UserResponse without loading full ORM entities
+USER_RESPONSE_COLUMNS = (
+    User.id, User.username, User.email, User.full_name, User.role,
+    User.is_active, User.is_verified, User.created_at, User.updated_at, User.last_login
+)
+
+# Login reads plain rows (no identity map or change tracking); the compiled
+# statement is reused from SQLAlchemy's cache on every call
+LOGIN_STMT = select(*USER_RESPONSE_COLUMNS, User.hashed_password).where(
+    or_(User.username == bindparam("u"), User.email == bindparam("u"))
+).limit(1)
+
+
+def _adapter_response(adapter: TypeAdapter, data, status_code: int = 200) -> Response:
+    """Serialize straight to JSON bytes with a prebuilt adapter (skips jsonable_encoder)"""
+    return Response(
+        adapter.dump_json(adapter.validate_python(data, from_attributes=True)),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+def _json_body(model: Type[BaseModel]):
+    """
+    Dependency that validates the raw request body with model_validate_json.
+
+    pydantic-core parses and validates in one pass, without FastAPI's
+    intermediate json.loads() dict. Errors are reported exactly as FastAPI's
+    own body parsing would, with locations under "body".
+    """
+    async def dependency(request: Request) -> BaseModel:
+        body = await request.body()
+        if not body:
+            missing = ValidationError.from_exception_data(
+                "body", [{"type": "missing", "loc": ("body",), "input": None}]
+            )
+            raise RequestValidationError(missing.errors(), body=body)
+
+        try:
+            return model.model_validate_json(body)
+        except ValidationError as e:
+            errors = e.errors()
+
+        if errors[0]["type"] == "json_invalid":
+            # Error path only: re-parse for the offset FastAPI reports
+            try:
+                json.loads(body)
+            except json.JSONDecodeError as e:
+                raise RequestValidationError([{
+                    "type": "json_invalid",
+                    "loc": ("body", e.pos),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": e.msg}
+                }], body=body)
+
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in errors], body=body
+        )
+    return dependency
+
+
+def _json_body_docs(model: Type[BaseModel]) -> dict:
+    """openapi_extra documenting a body read by _json_body"""
+    return {"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": model.model_json_schema()}}
+    }}
 
 
 @app.on_event("startup")
 async def startup():
-    print("🚀 Starting Auth Service...")
+    start_queue_logging()
+    logger.info("🚀 Starting Auth Service...")
     init_db()
     if check_db_connection():
-        print("✅ Database connected")
+        logger.info("✅ Database connected")
     else:
-        print("❌ Database connection failed")
+        logger.error("❌ Database connection failed")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = verify_token(token)
-        user_id = payload.get("user_id")
-        if not user_id:
-            raise credentials_exception
-    except Exception:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.is_active:
-        raise credentials_exception
-
-    return user
+@app.on_event("shutdown")
+async def shutdown():
+    stop_queue_logging()
 
 
 @app.get("/", response_model=MessageResponse)
@@ -86,28 +139,47 @@ async def health():
     }
 
 
-@app.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserRegister, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.username == user_data.username).first():
+@app.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_json_body_docs(UserRegister)
+)
+async def register(
+    user_data: UserRegister = Depends(_json_body(UserRegister)),
+    db: Session = Depends(get_db)
+):
+    existing = db.execute(
+        select(User.username, User.email)
+        .where(or_(User.username == user_data.username, User.email == user_data.email))
+        .limit(2)
+    ).all()
+
+    if any(row.username == user_data.username for row in existing):
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    if db.query(User).filter(User.email == user_data.email).first():
+    if existing:
         raise HTTPException(status_code=400, detail="Email already exists")
 
     user = User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await ahash_password(user_data.password),
         full_name=user_data.full_name,
         role=UserRole.USER
     )
 
     db.add(user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent registration
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Username or email already exists")
     db.refresh(user)
 
-    print(f"✅ User registered: {user.username}")
-    return user
+    logger.info("✅ User registered: %s", user.username)
+    return _adapter_response(USER_RESPONSE_ADAPTER, user, status.HTTP_201_CREATED)
 
 
 @app.post("/token", response_model=Token)
@@ -115,48 +187,63 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(
-        (User.username == form_data.username) | (User.email == form_data.username)
-    ).first()
+    # Usernames and emails are stored lower-cased
+    row = db.execute(LOGIN_STMT, {"u": form_data.username.lower()}).first()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not row or not await averify_password(form_data.password, row.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not user.is_active:
+    if not row.is_active:
         raise HTTPException(status_code=403, detail="Account inactive")
 
-    user.last_login = datetime.utcnow()
-    db.commit()
+    user = row._asdict()
+    changes = {}
+
+    # Upgrade legacy hashes (e.g. bcrypt) to the current scheme while we have the password
+    if needs_rehash(row.hashed_password):
+        changes["hashed_password"] = await ahash_password(form_data.password)
+
+    # last_login is informational; skip the write (and its fsync) on rapid re-logins
+    now = datetime.utcnow()
+    if not row.last_login or (now - row.last_login).total_seconds() > LAST_LOGIN_UPDATE_INTERVAL:
+        changes["last_login"] = user["last_login"] = now
+
+    if changes:
+        changes["updated_at"] = user["updated_at"] = now
+        db.execute(update(User).where(User.id == row.id).values(**changes))
+        db.commit()
+        # Cached snapshots for this user's other tokens are now stale
+        token_cache.clear_user(row.id)
 
     token = create_access_token(data={
-        "user_id": str(user.id),
-        "username": user.username,
-        "role": user.role.value
+        "user_id": str(row.id),
+        "username": row.username,
+        "role": ROLE_VALUES[row.role]
     })
 
-    print(f"✅ User logged in: {user.username}")
+    logger.info("✅ User logged in: %s", row.username)
 
-    return {
+    return _adapter_response(TOKEN_ADAPTER, {
         "access_token": token,
         "token_type": "bearer",
         "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         "user": user
-    }
+    })
 
 
 @app.get("/me", response_model=UserResponse)
 async def get_profile(current_user: User = Depends(get_current_user)):
-    return current_user
+    return _adapter_response(USER_RESPONSE_ADAPTER, current_user)
 
 
-@app.put("/me", response_model=UserResponse)
+@app.put("/me", response_model=UserResponse, openapi_extra=_json_body_docs(UserUpdate))
 async def update_profile(
-    update_data: UserUpdate,
     current_user: User = Depends(get_current_user),
+    update_data: UserUpdate = Depends(_json_body(UserUpdate)),
     db: Session = Depends(get_db)
 ):
     if update_data.email:
@@ -172,20 +259,22 @@ async def update_profile(
 
     db.commit()
     db.refresh(current_user)
-    return current_user
+    token_cache.clear_user(current_user.id)
+    return _adapter_response(USER_RESPONSE_ADAPTER, current_user)
 
 
-@app.post("/me/password", response_model=MessageResponse)
+@app.post("/me/password", response_model=MessageResponse, openapi_extra=_json_body_docs(PasswordChange))
 async def change_password(
-    password_data: PasswordChange,
     current_user: User = Depends(get_current_user),
+    password_data: PasswordChange = Depends(_json_body(PasswordChange)),
     db: Session = Depends(get_db)
 ):
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await averify_password(password_data.current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password incorrect")
 
-    current_user.hashed_password = hash_password(password_data.new_password)
+    current_user.hashed_password = await ahash_password(password_data.new_password)
     db.commit()
+    token_cache.clear_user(current_user.id)
 
     return {"message": "Password updated successfully"}
 
@@ -197,7 +286,8 @@ async def deactivate_account(
 ):
     current_user.is_active = False
     db.commit()
-    print(f"⚠️  Account deactivated: {current_user.username}")
+    token_cache.clear_user(current_user.id)
+    logger.warning("⚠️  Account deactivated: %s", current_user.username)
     return {"message": "Account deactivated successfully"}
 
 
@@ -208,10 +298,13 @@ async def list_users(
     skip: int = 0,
     limit: int = 100
 ):
-    if current_user.role != UserRole.ADMIN:
+    if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin required")
 
-    return db.query(User).offset(skip).limit(limit).all()
+    rows = db.execute(
+        select(*USER_RESPONSE_COLUMNS).offset(skip).limit(limit)
+    ).all()
+    return _adapter_response(USER_LIST_ADAPTER, rows)
 
 
 @app.get("/users/{user_id}", response_model=UserResponse)
@@ -220,14 +313,14 @@ async def get_user(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    if current_user.role != UserRole.ADMIN:
+    if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin required")
 
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+    return _adapter_response(USER_RESPONSE_ADAPTER, user)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+"""Bodies read by _json_body must fail with the same 422 as FastAPI's own parsing."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import app, get_db
+from shared.schemas import UserRegister
+
+JSON = {"Content-Type": "application/json"}
+
+# The same model, parsed the way FastAPI does it by default
+reference = FastAPI()
+
+
+@reference.post("/register")
+async def reference_register(user_data: UserRegister):
+    return {}
+
+
+@pytest.fixture
+def clients():
+    app.dependency_overrides[get_db] = lambda: None
+    yield TestClient(app), TestClient(reference)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("body", [
+    '{"username": "abc", "email": "not-an-email", "password": "Passw0rdX"}',
+    '{"username": "a", "email": "bad", "password": "short"}',
+    '{"username": "abc"}',
+    '{"username":',
+    '',
+])
+def test_register_422_matches_fastapi(clients, body):
+    ours, theirs = clients
+
+    response = ours.post("/register", content=body, headers=JSON)
+    expected = theirs.post("/register", content=body, headers=JSON)
+
+    assert response.status_code == 422
+    assert response.json() == expected.json()
+
+
+def test_field_errors_are_located_under_body(clients):
+    ours, _ = clients
+
+    response = ours.post(
+        "/register",
+        content='{"username": "abc", "email": "not-an-email", "password": "Passw0rdX"}',
+        headers=JSON
+    )
+
+    assert [error["loc"] for error in response.json()["detail"]] == [["body", "email"]]
+
+
+def test_bad_json_reports_body_offset(clients):
+    ours, _ = clients
+
+    response = ours.post("/register", content='{"username":', headers=JSON)
+
+    detail = response.json()["detail"]
+    assert detail[0]["type"] == "json_invalid"
+    assert detail[0]["loc"] == ["body", 12]
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("PUT", "/me", '{"email": "bad"}'),
+    ("POST", "/me/password", '{}'),
+])
+def test_authentication_runs_before_body_validation(clients, method, path, body):
+    ours, _ = clients
+
+    response = ours.request(method, path, content=body, headers=JSON)
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Could not validate credentials"}
@@ -0,0 +1,28 @@
+"""Token helpers must not change PyJWT's process-wide state."""
+import jwt
+import pytest
+from fastapi import HTTPException
+from jwt.algorithms import HMACAlgorithm
+
+from shared.utils import jwt_utils
+
+
+def test_global_hs256_is_left_alone():
+    assert type(jwt.api_jws._jws_global_obj._algorithms["HS256"]) is HMACAlgorithm
+
+
+def test_tokens_interoperate_with_stock_pyjwt():
+    token = jwt_utils.create_access_token({"user_id": "u1", "username": "alice"})
+
+    assert jwt.decode(token, jwt_utils.SECRET_KEY, algorithms=["HS256"])["username"] == "alice"
+    assert jwt_utils.verify_token(token)["user_id"] == "u1"
+
+
+def test_tampered_token_is_rejected():
+    token = jwt_utils.create_access_token({"user_id": "u1", "username": "alice"})
+    head, body, signature = token.split(".")
+    forged = ".".join((head, body, signature[::-1]))
+
+    with pytest.raises(HTTPException) as exc:
+        jwt_utils.verify_token(forged)
+    assert exc.value.status_code == 401
@@ -0,0 +1,59 @@
+"""A login that rewrites the user row must drop that user's cached tokens."""
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.main import LOGIN_STMT, app, get_db
+from shared.models import UserRole
+from shared.utils import hash_password, token_cache
+
+LoginRow = namedtuple("LoginRow", [
+    "id", "username", "email", "full_name", "role", "is_active",
+    "is_verified", "created_at", "updated_at", "last_login", "hashed_password"
+])
+
+
+class _FakeSession:
+    """Answers the login SELECT with one row and records everything else"""
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+        row = self.row if statement is LOGIN_STMT else None
+        return type("Result", (), {"first": lambda self: row})()
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_login_rewrite_invalidates_cached_tokens():
+    user_id = uuid.uuid4()
+    now = datetime.utcnow()
+    row = LoginRow(
+        user_id, "alice", "alice@example.com", None, UserRole.USER, True,
+        False, now, now, None, hash_password("Passw0rdX")
+    )
+    db = _FakeSession(row)
+    app.dependency_overrides[get_db] = lambda: db
+
+    token_hash = token_cache.hash_token("cached-token")
+    token_cache.store(
+        token_hash, {"exp": time.time() + 60}, {"id": user_id, "hashed_password": "stale"}
+    )
+    try:
+        response = TestClient(app).post(
+            "/token", data={"username": "alice", "password": "Passw0rdX"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert db.commits == 1  # last_login (first login) written
+    assert token_cache.lookup(token_hash) is None
@@ -0,0 +1,20 @@
+"""Email values must normalize to one form before they reach users.email."""
+import pytest
+from pydantic import ValidationError
+
+from shared.schemas import UserRegister, UserUpdate
+
+
+def test_register_email_is_lower_cased():
+    user = UserRegister(username="alice", email="Foo@Example.COM", password="Passw0rdX")
+
+    assert user.email == "foo@example.com"
+
+
+def test_update_email_is_lower_cased():
+    assert UserUpdate(email="Foo@Example.com").email == "foo@example.com"
+
+
+def test_invalid_email_is_rejected():
+    with pytest.raises(ValidationError):
+        UserRegister(username="alice", email="not-an-email", password="Passw0rdX")
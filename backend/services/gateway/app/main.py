@@ -1,8 +1,6 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from shared.app_factory import create_app
 
-app = FastAPI(title="DeepTrust API Gateway", docs_url="/docs")
-app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app = create_app("API Gateway", docs_url="/docs")
 
 @app.get("/health")
 async def health():
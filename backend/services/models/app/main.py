@@ -2,13 +2,14 @@
 DeepTrust Models Service
 Deepfake detection ML models API.
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import UploadFile, File, HTTPException
+from typing import List
 from PIL import Image
 import io
-import os
 import logging
 
+from shared.app_factory import create_app
+
 # Initialize models
 from app.models.mesonet import MesoNet
 from app.models.xception import XceptionNet
@@ -19,19 +20,7 @@ from app.models.ensemble import EnsembleDetector
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="DeepTrust Models Service",
-    description="ML models for deepfake detection",
-    version="1.0.0"
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=os.getenv("ALLOWED_ORIGINS", "*").split(","),
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app = create_app("Models Service", "ML models for deepfake detection")
 
 
 # Global model instances
@@ -74,6 +63,7 @@ async def root():
         "models": ["MesoNet", "XceptionNet", "Frequency", "Biological"],
         "endpoints": {
             "predict": "/predict",
+            "predict_batch": "/predict/batch",
             "health": "/health",
             "docs": "/docs"
         }
@@ -100,11 +90,11 @@ async def health():
 
 
 @app.post("/predict")
-async def predict(file: UploadFile = File(...)):
+async def predict(file: UploadFile = File(...), verbose: bool = False):
     """
     Predict if uploaded image/video is a deepfake.
     
-    Returns complete ensemble analysis with all model predictions.
+    Returns ensemble analysis; pass ?verbose=true for every model's full output.
     """
     if not ensemble:
         raise HTTPException(status_code=503, detail="Models not loaded")
@@ -123,7 +113,7 @@ async def predict(file: UploadFile = File(...)):
         logger.info(f"🔍 Analyzing {file.filename} ({image.size})")
         
         # Run ensemble prediction
-        result = ensemble.predict(image)
+        result = ensemble.predict(image, verbose=verbose)
         
         # Add metadata
         result['file_info'] = {
@@ -140,6 +130,48 @@ async def predict(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@app.post("/predict/batch")
+async def predict_batch(files: List[UploadFile] = File(...), verbose: bool = False):
+    """
+    Predict several images (e.g. video frames) in one request.
+    
+    Frames are analyzed concurrently; results are returned in upload order.
+    """
+    if not ensemble:
+        raise HTTPException(status_code=503, detail="Models not loaded")
+    
+    try:
+        images = []
+        file_infos = []
+        for file in files:
+            contents = await file.read()
+            image = Image.open(io.BytesIO(contents))
+            image_format = image.format
+            
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            
+            images.append(image)
+            file_infos.append({
+                'filename': file.filename,
+                'size': len(contents),
+                'dimensions': image.size,
+                'format': image_format
+            })
+        
+        logger.info(f"🔍 Analyzing batch of {len(images)} images")
+        
+        results = ensemble.predict_batch(images, verbose=verbose)
+        for result, file_info in zip(results, file_infos):
+            result['file_info'] = file_info
+        
+        return {"results": results}
+        
+    except Exception as e:
+        logger.error(f"❌ Batch prediction failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
+
 @app.post("/predict/mesonet")
 async def predict_mesonet(file: UploadFile = File(...)):
     """MesoNet only prediction"""
@@ -6,10 +6,77 @@ Real humans blink naturally; deepfakes often have unnatural blink patterns.
 import numpy as np
 import cv2
 from PIL import Image
+import threading
 import logging
+import os
+
+from app.models.kernels import symmetry_mse, region_variance
+from app.models.prepared import PreparedImage
 
 logger = logging.getLogger(__name__)
 
+MODEL_PATH = os.getenv("MODEL_PATH", "/app/weights")
+YUNET_MODEL = os.path.join(MODEL_PATH, "face_detection_yunet_2023mar.onnx")
+FACE_DETECTOR = os.getenv("FACE_DETECTOR", "yunet").lower()  # "yunet" or "haar"
+DETECTION_MAX_SIDE = 480  # detection runs on a thumbnail; crops come from full res
+
+YUNET_AVAILABLE = hasattr(cv2, "FaceDetectorYN") and os.path.exists(YUNET_MODEL)
+
+# FaceDetectorYN keeps the input size as state, so each thread gets its own
+# detector (the model is small) rather than serializing detection on a lock
+_yunet_local = threading.local()
+
+
+def _get_yunet():
+    """This thread's YuNet detector, or None if it isn't available"""
+    if not YUNET_AVAILABLE:
+        return None
+    detector = getattr(_yunet_local, "detector", None)
+    if detector is None:
+        detector = cv2.FaceDetectorYN.create(YUNET_MODEL, "", (320, 320), score_threshold=0.6)
+        _yunet_local.detector = detector
+    return detector
+
+
+# Haar fallback, parsed once per process
+_face_cascade = None
+_eye_cascade = None
+_cascade_lock = threading.Lock()
+
+
+def _get_face_cascade():
+    """Load the shared frontal-face Haar cascade"""
+    global _face_cascade
+    with _cascade_lock:
+        if _face_cascade is None:
+            _face_cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            )
+    return _face_cascade
+
+
+def _get_eye_cascade():
+    """Load the shared eye Haar cascade"""
+    global _eye_cascade
+    with _cascade_lock:
+        if _eye_cascade is None:
+            _eye_cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + 'haarcascade_eye.xml'
+            )
+    return _eye_cascade
+
+
+def _downscale(image):
+    """Shrink image so its longer side is at most DETECTION_MAX_SIDE; returns (small, scale)"""
+    h, w = image.shape[:2]
+    scale = max(1.0, max(h, w) / DETECTION_MAX_SIDE)
+    if scale == 1.0:
+        return image, 1.0
+    
+    size = (max(1, int(w / scale)), max(1, int(h / scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA), scale
+
+
 class BiologicalAnalyzer:
     """
     Biological signal analysis for deepfake detection.
@@ -27,40 +94,132 @@ class BiologicalAnalyzer:
     """
     
     def __init__(self):
-        # Load face detector
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        # Face detector: YuNet gives the face box and eye landmarks in one pass
+        self.use_yunet = FACE_DETECTOR == "yunet" and _get_yunet() is not None
+        
+        if not self.use_yunet:
+            if FACE_DETECTOR == "yunet":
+                logger.warning(f"⚠️  YuNet model not found at {YUNET_MODEL}, using Haar cascades")
+            self.face_cascade = _get_face_cascade()
+            self.eye_cascade = _get_eye_cascade()
+        
+        detector_name = "YuNet" if self.use_yunet else "Haar"
+        logger.info(f"✅ Biological Analyzer initialized ({detector_name})")
+    
+    def _as_arrays(self, image):
+        """Return (pixels, grayscale) arrays for any supported input"""
+        if isinstance(image, PreparedImage):
+            return image.rgb_u8, image.gray_u8
+        
+        if isinstance(image, Image.Image):
+            image = np.array(image)
+        
+        if len(image.shape) == 3:
+            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        else:
+            gray = image
+        return image, gray
+    
+    def _detect_landmarks(self, image):
+        """
+        Run YuNet on an RGB or grayscale array.
+        
+        Returns:
+            Array of rows [x, y, w, h, right_eye_x, right_eye_y, left_eye_x,
+            left_eye_y, nose_x, nose_y, mouth_rx, mouth_ry, mouth_lx, mouth_ly, score]
+        """
+        if len(image.shape) == 2:
+            bgr = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        elif image.shape[2] == 4:
+            bgr = cv2.cvtColor(image, cv2.COLOR_RGBA2BGR)
+        else:
+            bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        
+        small, scale = _downscale(bgr)
+        h, w = small.shape[:2]
+        detector = _get_yunet()
+        detector.setInputSize((w, h))
+        _, faces = detector.detect(small)
+        
+        if faces is None:
+            return np.empty((0, 15), dtype=np.float32)
+        
+        # Map box and landmarks back to full-resolution coordinates
+        faces[:, :14] *= scale
+        return faces
+    
+    def detect_regions(self, image, gray):
+        """
+        Locate faces and eyes once for all biological checks.
+        
+        Args:
+            image: RGB (or grayscale) pixel array
+            gray: Grayscale version of image
+            
+        Returns:
+            (faces, eyes) - sequences of (x, y, w, h) boxes in full-resolution pixels
+        """
+        if self.use_yunet:
+            landmarks = self._detect_landmarks(image)
+            if len(landmarks) == 0:
+                return landmarks[:, :4], []
+            
+            # Fixed window around each eye landmark, sized from the face box
+            face = landmarks[0]
+            half = max(4, int(face[2] * 0.1))
+            eyes = []
+            for cx, cy in ((face[4], face[5]), (face[6], face[7])):
+                ex, ey = max(int(cx) - half, 0), max(int(cy) - half, 0)
+                eyes.append((ex, ey, 2 * half, 2 * half))
+            return landmarks[:, :4], eyes
+        
+        small, scale = _downscale(gray)
+        faces = self.face_cascade.detectMultiScale(
+            small, scaleFactor=1.2, minNeighbors=5, minSize=(40, 40)
         )
-        self.eye_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_eye.xml'
+        if len(faces) > 0:
+            faces = faces * scale
+        
+        eyes = self.eye_cascade.detectMultiScale(
+            small, scaleFactor=1.2, minNeighbors=3, minSize=(15, 15)
         )
-        logger.info("✅ Biological Analyzer initialized")
+        if len(eyes) > 0:
+            eyes = (eyes * scale).astype(int)
+        
+        return faces, eyes
     
-    def detect_face_symmetry(self, image):
+    def detect_face_symmetry(self, image, faces=None):
         """
         Analyze facial symmetry.
         Deepfakes often have unnatural perfect symmetry.
         
+        Args:
+            image: PIL Image, numpy array or PreparedImage
+            faces: Face boxes from detect_regions; detected here if omitted
+        
         Returns:
             Symmetry score [0-1] - higher = more symmetric = more suspicious
         """
-        if isinstance(image, Image.Image):
-            image = np.array(image)
-        
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = image
+        image, gray = self._as_arrays(image)
         
         # Detect faces
-        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        if faces is None:
+            faces, _ = self.detect_regions(image, gray)
         
+        return self._face_symmetry(gray, faces)
+    
+    def _face_symmetry(self, gray, faces):
+        """Symmetry score for the first detected face"""
         if len(faces) == 0:
             return 0.5  # No face detected, neutral score
         
-        # Take first detected face
-        (x, y, w, h) = faces[0]
+        # Take first detected face (YuNet boxes may extend past the frame)
+        x, y, w, h = (int(v) for v in faces[0])
+        x, y = max(x, 0), max(y, 0)
         face = gray[y:y+h, x:x+w]
+        w = face.shape[1]
+        if w < 2:
+            return 0.5
         
         # Split face vertically
         mid = w // 2
@@ -73,7 +232,7 @@ class BiologicalAnalyzer:
         right_half = cv2.resize(right_half, (min_width, face.shape[0]))
         
         # Calculate similarity (MSE)
-        mse = np.mean((left_half.astype(float) - right_half.astype(float)) ** 2)
+        mse = symmetry_mse(left_half, right_half)
         
         # Normalize - perfect symmetry (low MSE) is suspicious
         # Natural faces have some asymmetry
@@ -81,25 +240,28 @@ class BiologicalAnalyzer:
         
         return float(symmetry_score)
     
-    def detect_eye_patterns(self, image):
+    def detect_eye_patterns(self, image, eyes=None):
         """
         Analyze eye patterns.
         Deepfakes often have unnatural eye rendering.
         
+        Args:
+            image: PIL Image, numpy array or PreparedImage
+            eyes: Eye boxes from detect_regions; detected here if omitted
+        
         Returns:
             Anomaly score [0-1]
         """
-        if isinstance(image, Image.Image):
-            image = np.array(image)
-        
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = image
+        image, gray = self._as_arrays(image)
         
         # Detect eyes
-        eyes = self.eye_cascade.detectMultiScale(gray, 1.1, 3)
+        if eyes is None:
+            _, eyes = self.detect_regions(image, gray)
         
+        return self._eye_patterns(gray, eyes)
+    
+    def _eye_patterns(self, gray, eyes):
+        """Texture anomaly score for the first two detected eyes"""
         if len(eyes) < 2:
             return 0.5  # Need at least 2 eyes
         
@@ -107,9 +269,11 @@ class BiologicalAnalyzer:
         eye_scores = []
         for (ex, ey, ew, eh) in eyes[:2]:  # Take first 2 eyes
             eye_region = gray[ey:ey+eh, ex:ex+ew]
+            if eye_region.size == 0:
+                return 0.5
             
             # Calculate variance (deepfakes often have uniform eye texture)
-            variance = np.var(eye_region)
+            variance = region_variance(eye_region)
             
             # Low variance = suspicious
             eye_scores.append(1.0 / (1.0 + variance / 100.0))
@@ -121,14 +285,18 @@ class BiologicalAnalyzer:
         Combined biological signal analysis.
         
         Args:
-            image: PIL Image or numpy array
+            image: PIL Image, numpy array or PreparedImage
             
         Returns:
             dict with 'score' (0-1) and 'is_fake' (bool)
         """
         try:
-            symmetry_score = self.detect_face_symmetry(image)
-            eye_score = self.detect_eye_patterns(image)
+            # One detection pass shared by both checks
+            pixels, gray = self._as_arrays(image)
+            faces, eyes = self.detect_regions(pixels, gray)
+            
+            symmetry_score = self._face_symmetry(gray, faces)
+            eye_score = self._eye_patterns(gray, eyes)
             
             # Weighted combination
             combined_score = (symmetry_score * 0.6 + eye_score * 0.4)
@@ -4,11 +4,25 @@ Combines predictions from multiple models using weighted voting.
 """
 import numpy as np
 import logging
-from typing import Dict, Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
 from PIL import Image
 
+from app.models.gpu_preprocess import CUDA_AVAILABLE, GpuPreprocessor
+from app.models.prepared import prepare_image
+
 logger = logging.getLogger(__name__)
 
+# One worker per model; OpenCV/NumPy/SciPy release the GIL in their kernels
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ensemble")
+
+# Frame-level parallelism for batches. Each batch worker runs a frame's four
+# models inline, so a batch keeps up to ENSEMBLE_BATCH_WORKERS models busy
+# instead of queueing behind the 4 workers of _POOL
+ENSEMBLE_BATCH_WORKERS = int(os.getenv("ENSEMBLE_BATCH_WORKERS", str(os.cpu_count() or 4)))
+_BATCH_POOL = ThreadPoolExecutor(max_workers=ENSEMBLE_BATCH_WORKERS, thread_name_prefix="ensemble-batch")
+
 
 class EnsembleDetector:
     """
@@ -23,6 +37,8 @@ class EnsembleDetector:
     Decision: Weighted voting with confidence scores
     """
     
+    MODEL_NAMES = ('mesonet', 'xception', 'frequency', 'biological')
+    
     def __init__(self, mesonet, xception, frequency, biological):
         self.mesonet = mesonet
         self.xception = xception
@@ -36,16 +52,25 @@ class EnsembleDetector:
             'frequency': 0.20,
             'biological': 0.15
         }
+        self._weight_vector = np.array(
+            [self.weights[name] for name in self.MODEL_NAMES], dtype=np.float32
+        )
+        
+        # Optional GPU path for the resized model inputs
+        self.gpu = GpuPreprocessor() if CUDA_AVAILABLE else None
         
         logger.info("✅ Ensemble Detector initialized")
         logger.info(f"   Weights: {self.weights}")
     
-    def predict(self, image: Image.Image) -> Dict[str, Any]:
+    def predict(self, image: Image.Image, verbose: bool = False, parallel: bool = True) -> Dict[str, Any]:
         """
         Run ensemble prediction on image.
         
         Args:
             image: PIL Image
+            verbose: Include each model's full output under 'model_details'
+            parallel: Fan the four models out to the model pool; batch
+                workers pass False and run them inline
             
         Returns:
             Complete analysis with all model predictions
@@ -53,54 +78,38 @@ class EnsembleDetector:
         try:
             logger.info("🔍 Running ensemble detection...")
             
-            # Run all models in parallel
-            mesonet_result = self.mesonet.predict(image)
-            xception_result = self.xception.predict(image)
-            frequency_result = self.frequency.predict(image)
-            biological_result = self.biological.predict(image)
+            # Decode, grayscale and resize once for all four models
+            prepared = prepare_image(image, self.gpu)
             
-            # Extract scores
-            scores = {
-                'mesonet': mesonet_result['score'],
-                'xception': xception_result['score'],
-                'frequency': frequency_result['score'],
-                'biological': biological_result['score']
-            }
+            models = (self.mesonet, self.xception, self.frequency, self.biological)
+            if parallel:
+                # Run all models in parallel
+                futures = [_POOL.submit(model.predict, prepared) for model in models]
+                results = [future.result() for future in futures]
+            else:
+                results = [model.predict(prepared) for model in models]
             
-            # Calculate weighted ensemble score
-            ensemble_score = (
-                scores['mesonet'] * self.weights['mesonet'] +
-                scores['xception'] * self.weights['xception'] +
-                scores['frequency'] * self.weights['frequency'] +
-                scores['biological'] * self.weights['biological']
-            )
+            # Weighted ensemble score as a single dot product
+            scores = np.array([r['score'] for r in results], dtype=np.float32)
+            ensemble_score = float(self._weight_vector @ scores)
             
             # Final decision
             is_deepfake = ensemble_score > 0.5
             confidence = abs(ensemble_score - 0.5) * 2  # 0-1 scale
             
             # Voting breakdown
-            votes = {
-                'mesonet': mesonet_result['is_fake'],
-                'xception': xception_result['is_fake'],
-                'frequency': frequency_result['is_fake'],
-                'biological': biological_result['is_fake']
-            }
-            
+            votes = {name: bool(r['is_fake']) for name, r in zip(self.MODEL_NAMES, results)}
             votes_fake = sum(votes.values())
             votes_real = len(votes) - votes_fake
             
             result = {
                 'is_deepfake': bool(is_deepfake),
                 'confidence_score': float(confidence),
-                'ensemble_score': float(ensemble_score),
+                'ensemble_score': ensemble_score,
                 
                 # Individual model scores
                 'model_scores': {
-                    'mesonet': float(scores['mesonet']),
-                    'xception': float(scores['xception']),
-                    'frequency': float(scores['frequency']),
-                    'biological': float(scores['biological'])
+                    name: float(r['score']) for name, r in zip(self.MODEL_NAMES, results)
                 },
                 
                 # Voting breakdown
@@ -111,17 +120,13 @@ class EnsembleDetector:
                 },
                 
                 # Weights used
-                'ensemble_weights': self.weights,
-                
-                # Detailed model outputs
-                'model_details': {
-                    'mesonet': mesonet_result,
-                    'xception': xception_result,
-                    'frequency': frequency_result,
-                    'biological': biological_result
-                }
+                'ensemble_weights': self.weights
             }
             
+            # Detailed model outputs
+            if verbose:
+                result['model_details'] = dict(zip(self.MODEL_NAMES, results))
+            
             verdict = "DEEPFAKE" if is_deepfake else "AUTHENTIC"
             logger.info(f"✅ Ensemble verdict: {verdict} ({confidence:.2%} confidence)")
             
@@ -134,4 +139,18 @@ class EnsembleDetector:
                 'confidence_score': 0.0,
                 'ensemble_score': 0.5,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+    
+    def predict_batch(self, images: List[Image.Image], verbose: bool = False) -> List[Dict[str, Any]]:
+        """
+        Run ensemble prediction on several images (e.g. video frames) concurrently.
+        
+        Args:
+            images: PIL Images
+            verbose: Include each model's full output under 'model_details'
+            
+        Returns:
+            One result per image, in input order
+        """
+        futures = [_BATCH_POOL.submit(self.predict, image, verbose, False) for image in images]
+        return [future.result() for future in futures]
@@ -0,0 +1,126 @@
+"""
+GPU Preprocessing
+Grayscale + resize on CUDA via Numba, used when a GPU is present.
+Follows the CPU rule in prepared.resize_square (area when shrinking, bilinear otherwise).
+"""
+import numpy as np
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import cuda
+    CUDA_AVAILABLE = cuda.is_available()
+except Exception:
+    CUDA_AVAILABLE = False
+
+
+if CUDA_AVAILABLE:
+    @cuda.jit
+    def _gray_kernel(src, gray):
+        """One thread per pixel: BT.601 luma -> uint8, bit-exact with cv2.COLOR_RGB2GRAY"""
+        y, x = cuda.grid(2)
+        if y >= gray.shape[0] or x >= gray.shape[1]:
+            return
+        # OpenCV's 15-bit fixed-point weights for 0.299 / 0.587 / 0.114
+        luma = 9798 * np.int32(src[y, x, 0]) + 19235 * np.int32(src[y, x, 1]) + 3735 * np.int32(src[y, x, 2])
+        gray[y, x] = np.uint8((luma + 16384) >> 15)
+
+    @cuda.jit
+    def _resize_area_kernel(gray, dst):
+        """
+        One thread per output pixel: mean of the source pixels it covers,
+        weighted by overlap (cv2.INTER_AREA when shrinking)
+        """
+        y, x = cuda.grid(2)
+        out_h, out_w = dst.shape
+        if y >= out_h or x >= out_w:
+            return
+
+        in_h, in_w = gray.shape
+        scale_y = in_h / out_h
+        scale_x = in_w / out_w
+        y0, y1 = y * scale_y, (y + 1) * scale_y
+        x0, x1 = x * scale_x, (x + 1) * scale_x
+
+        acc = 0.0
+        for iy in range(int(y0), min(int(math.ceil(y1)), in_h)):
+            wy = min(iy + 1.0, y1) - max(float(iy), y0)
+            row = 0.0
+            for ix in range(int(x0), min(int(math.ceil(x1)), in_w)):
+                wx = min(ix + 1.0, x1) - max(float(ix), x0)
+                row += gray[iy, ix] * wx
+            acc += row * wy
+        dst[y, x] = np.uint8(min(acc / (scale_y * scale_x) + 0.5, 255.0))
+
+    @cuda.jit
+    def _resize_linear_kernel(gray, dst):
+        """One thread per output pixel: bilinear sample (cv2.INTER_LINEAR)"""
+        y, x = cuda.grid(2)
+        out_h, out_w = dst.shape
+        if y >= out_h or x >= out_w:
+            return
+
+        in_h, in_w = gray.shape
+        sy = min(max((y + 0.5) * in_h / out_h - 0.5, 0.0), in_h - 1.0)
+        sx = min(max((x + 0.5) * in_w / out_w - 0.5, 0.0), in_w - 1.0)
+        y0 = int(sy)
+        x0 = int(sx)
+        y1 = min(y0 + 1, in_h - 1)
+        x1 = min(x0 + 1, in_w - 1)
+        fy = sy - y0
+        fx = sx - x0
+
+        top = gray[y0, x0] * (1.0 - fx) + gray[y0, x1] * fx
+        bottom = gray[y1, x0] * (1.0 - fx) + gray[y1, x1] * fx
+        dst[y, x] = np.uint8(min(top * (1.0 - fy) + bottom * fy + 0.5, 255.0))
+
+
+class GpuPreprocessor:
+    """
+    Grayscale + resize for the CNN-style models on the GPU.
+
+    The RGB image is uploaded and converted to grayscale once; every
+    requested output size is produced from the same device buffer.
+    """
+
+    BLOCK = (16, 16)
+
+    def __init__(self):
+        if not CUDA_AVAILABLE:
+            raise RuntimeError("CUDA is not available")
+        logger.info("✅ GPU Preprocessor initialized")
+
+    def _grid(self, h, w):
+        return ((h + self.BLOCK[0] - 1) // self.BLOCK[0],
+                (w + self.BLOCK[1] - 1) // self.BLOCK[1])
+
+    def preprocess(self, image, sizes):
+        """
+        Produce square uint8 grayscale versions of an RGB image.
+
+        Args:
+            image: PIL Image or HxWx3 numpy array
+            sizes: Output side lengths, e.g. (256, 299)
+
+        Returns:
+            dict mapping size -> grayscale array, or None for non-RGB input
+        """
+        rgb = np.asarray(image)
+        if rgb.ndim != 3 or rgb.shape[2] < 3 or rgb.dtype != np.uint8:
+            return None
+
+        h, w = rgb.shape[:2]
+        d_src = cuda.to_device(np.ascontiguousarray(rgb[:, :, :3]))
+        d_gray = cuda.device_array((h, w), dtype=np.uint8)
+        _gray_kernel[self._grid(h, w), self.BLOCK](d_src, d_gray)
+
+        resized = {}
+        for size in sizes:
+            d_dst = cuda.device_array((size, size), dtype=np.uint8)
+            kernel = _resize_area_kernel if h >= size and w >= size else _resize_linear_kernel
+            kernel[self._grid(size, size), self.BLOCK](d_gray, d_dst)
+            resized[size] = d_dst.copy_to_host()
+
+        return resized
@@ -0,0 +1,127 @@
+"""
+Pixel Reduction Kernels
+Single-pass image statistics shared by the lightweight models.
+Compiled with Numba when it is installed; NumPy/OpenCV otherwise.
+"""
+import numpy as np
+import cv2
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _symmetry_mse_np(left, right):
+    if left.dtype == np.uint8 and right.dtype == np.uint8:
+        # |a - b| stays in uint8 and its square fits in uint16
+        diff = cv2.absdiff(left, right).astype(np.uint16)
+        return float(np.mean(diff * diff))
+    diff = left.astype(np.float32) - right.astype(np.float32)
+    return float(np.mean(diff * diff))
+
+
+def _variance_np(region):
+    if region.dtype != np.uint8:
+        return float(np.var(region, dtype=np.float32))
+    # One pass of exact integer sums instead of np.var's mean + deviation passes
+    n = region.size
+    s = int(region.sum(dtype=np.int64))
+    sq = int(np.multiply(region, region, dtype=np.uint32).sum(dtype=np.uint64))
+    return (n * sq - s * s) / (n * n)
+
+
+def _texture_stats_np(gray):
+    variance = _variance_np(gray) / (255.0 * 255.0)
+    edges_h = cv2.absdiff(gray[1:, :], gray[:-1, :])
+    edges_v = cv2.absdiff(gray[:, 1:], gray[:, :-1])
+    return float(variance), float((edges_h.mean() + edges_v.mean()) / 255.0)
+
+
+if NUMBA_AVAILABLE:
+    # nogil lets the ensemble's worker threads run kernels side by side.
+    # No parallel=True: Numba's default threading layer is not safe to
+    # enter from several Python threads at once.
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _symmetry_mse_jit(left, right):
+        h, w = left.shape
+        total = 0.0
+        for i in range(h):
+            for j in range(w):
+                d = float(left[i, j]) - float(right[i, j])
+                total += d * d
+        return total / (h * w)
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _region_variance_jit(region):
+        h, w = region.shape
+        s = 0.0
+        sq = 0.0
+        for i in range(h):
+            for j in range(w):
+                v = float(region[i, j])
+                s += v
+                sq += v * v
+        n = h * w
+        mean = s / n
+        return max(sq / n - mean * mean, 0.0)
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _texture_stats_jit(gray):
+        h, w = gray.shape
+        s = 0.0
+        sq = 0.0
+        edge_h = 0.0
+        edge_v = 0.0
+        for i in range(h):
+            for j in range(w):
+                v = float(gray[i, j])
+                s += v
+                sq += v * v
+                if i > 0:
+                    edge_h += abs(v - float(gray[i - 1, j]))
+                if j > 0:
+                    edge_v += abs(v - float(gray[i, j - 1]))
+
+        n = h * w
+        mean = s / n
+        variance = max(sq / n - mean * mean, 0.0) / (255.0 * 255.0)
+
+        edge_strength = 0.0
+        if h > 1:
+            edge_strength += edge_h / ((h - 1) * w)
+        if w > 1:
+            edge_strength += edge_v / (h * (w - 1))
+        return variance, edge_strength / 255.0
+
+
+def symmetry_mse(left, right):
+    """Mean squared difference between two equally sized grayscale arrays"""
+    if NUMBA_AVAILABLE:
+        return float(_symmetry_mse_jit(left, right))
+    return _symmetry_mse_np(left, right)
+
+
+def region_variance(region):
+    """Pixel variance of a 2D grayscale region"""
+    if NUMBA_AVAILABLE:
+        return float(_region_variance_jit(region))
+    return _variance_np(region)
+
+
+def texture_stats(gray):
+    """
+    Texture statistics of a uint8 grayscale image in one pass.
+
+    Returns:
+        (variance, edge_strength) with pixels scaled to [0, 1];
+        edge_strength is the sum of mean vertical and horizontal neighbour differences
+    """
+    if NUMBA_AVAILABLE:
+        variance, edge_strength = _texture_stats_jit(gray)
+        return float(variance), float(edge_strength)
+    return _texture_stats_np(gray)
@@ -2,10 +2,11 @@
 MesoNet - Simplified Deepfake Detection
 Lightweight version using statistical analysis instead of CNN.
 """
-import numpy as np
-from PIL import Image
 import logging
 
+from app.models.kernels import texture_stats
+from app.models.prepared import PreparedImage, resize_square, to_gray_u8
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,34 +21,22 @@ class MesoNet:
         logger.info("✅ MesoNet (Lightweight) initialized")
     
     def preprocess(self, image):
-        """Preprocess image"""
-        if hasattr(image, 'resize'):
-            image = image.resize((256, 256))
-            image = np.array(image)
-        
-        if len(image.shape) == 2:
-            image = np.stack([image] * 3, axis=-1)
-        elif image.shape[-1] == 4:
-            image = image[:, :, :3]
-        
-        image = image.astype(np.float32) / 255.0
-        return image
+        """Preprocess image to a 256x256 uint8 grayscale array"""
+        # Same grayscale-then-resize rule as prepare_image()
+        return resize_square(to_gray_u8(image), 256)
     
     def predict(self, image):
         """
         Detect deepfakes using texture analysis.
         """
         try:
-            preprocessed = self.preprocess(image)
-            
-            # Analyze texture variance
-            gray = np.mean(preprocessed, axis=2)
-            variance = np.var(gray)
+            if isinstance(image, PreparedImage):
+                gray_u8 = image.gray_256
+            else:
+                gray_u8 = self.preprocess(image)
             
-            # Analyze edge sharpness
-            edges_h = np.abs(np.diff(gray, axis=0))
-            edges_v = np.abs(np.diff(gray, axis=1))
-            edge_strength = np.mean(edges_h) + np.mean(edges_v)
+            # Texture variance and edge sharpness in a single pass
+            variance, edge_strength = texture_stats(gray_u8)
             
             # Combine metrics
             texture_score = 1.0 - min(variance * 10, 1.0)
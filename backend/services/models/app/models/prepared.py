@@ -0,0 +1,95 @@
+"""
+Prepared Image
+One decoded/resized view of the input, shared by all ensemble models.
+"""
+from dataclasses import dataclass
+import numpy as np
+import cv2
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """
+    Arrays every model reads from, built once per ensemble call.
+
+    rgb_u8:   HxWx3 original pixels (biological face detection)
+    gray_u8:  HxW grayscale at full resolution (frequency, biological)
+    gray_256: 256x256 grayscale (MesoNet)
+    gray_299: 299x299 grayscale (XceptionNet)
+    """
+    rgb_u8: np.ndarray
+    gray_u8: np.ndarray
+    gray_256: np.ndarray
+    gray_299: np.ndarray
+
+
+def resize_square(gray, size):
+    """
+    Resize a grayscale array to size x size.
+
+    INTER_AREA when shrinking (both sides at least `size`), INTER_LINEAR
+    when enlarging. Every model input goes through this rule, so a model
+    scores the same image the same way on every route.
+    """
+    h, w = gray.shape[:2]
+    if h == size and w == size:
+        return gray
+    interpolation = cv2.INTER_AREA if h >= size and w >= size else cv2.INTER_LINEAR
+    return cv2.resize(gray, (size, size), interpolation=interpolation)
+
+
+def to_gray_u8(image):
+    """uint8 grayscale array from a PIL Image or gray/RGB/RGBA array"""
+    pixels = np.asarray(image)
+    if pixels.dtype != np.uint8:
+        pixels = pixels.astype(np.uint8)
+
+    if pixels.ndim == 2:
+        return pixels
+    if pixels.shape[2] == 4:
+        return cv2.cvtColor(pixels, cv2.COLOR_RGBA2GRAY)
+    return cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY)
+
+
+def prepare_image(image, gpu=None) -> PreparedImage:
+    """
+    Build a PreparedImage from a PIL Image or numpy array.
+
+    Args:
+        image: PIL Image or numpy array (gray, RGB or RGBA)
+        gpu: Optional GpuPreprocessor for the two resized views
+
+    Returns:
+        PreparedImage
+    """
+    rgb = np.asarray(image)
+    if rgb.dtype != np.uint8:
+        rgb = rgb.astype(np.uint8)
+
+    if rgb.ndim == 2:
+        gray = rgb
+        rgb = cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+    else:
+        if rgb.shape[2] == 4:
+            rgb = cv2.cvtColor(rgb, cv2.COLOR_RGBA2RGB)
+        gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+
+    resized = None
+    if gpu is not None:
+        try:
+            resized = gpu.preprocess(rgb, (256, 299))
+        except Exception as e:
+            logger.warning(f"⚠️  GPU preprocessing failed, using CPU: {e}")
+
+    if resized is None:
+        resized = {size: resize_square(gray, size) for size in (256, 299)}
+
+    return PreparedImage(
+        rgb_u8=rgb,
+        gray_u8=gray,
+        gray_256=resized[256],
+        gray_299=resized[299]
+    )
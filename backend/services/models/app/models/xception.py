@@ -3,12 +3,17 @@ XceptionNet - Simplified Deepfake Detection
 Lightweight version using HOG features.
 """
 import numpy as np
-from PIL import Image
-from skimage.feature import hog
+import cv2
 import logging
 
+from app.models.prepared import PreparedImage, resize_square, to_gray_u8
+
 logger = logging.getLogger(__name__)
 
+# 9 orientations, 8x8 cells, 2x2-cell blocks; 296 is the largest window
+# that tiles the block stride inside the 299x299 input
+_HOG = cv2.HOGDescriptor((296, 296), (16, 16), (8, 8), (8, 8), 9)
+
 
 class XceptionNet:
     """Simplified XceptionNet using feature extraction."""
@@ -18,33 +23,20 @@ class XceptionNet:
         logger.info("✅ XceptionNet (Lightweight) initialized")
     
     def preprocess(self, image):
-        """Preprocess image"""
-        if hasattr(image, 'resize'):
-            image = image.resize((299, 299))
-            image = np.array(image)
-        
-        if len(image.shape) == 2:
-            image = np.stack([image] * 3, axis=-1)
-        elif image.shape[-1] == 4:
-            image = image[:, :, :3]
-        
-        image = image.astype(np.float32) / 255.0
-        return image
+        """Preprocess image to a 299x299 uint8 grayscale array"""
+        # Same grayscale-then-resize rule as prepare_image()
+        return resize_square(to_gray_u8(image), 299)
     
     def predict(self, image):
         """Detect deepfakes using HOG features."""
         try:
-            preprocessed = self.preprocess(image)
-            gray = np.mean(preprocessed, axis=2)
+            if isinstance(image, PreparedImage):
+                gray_u8 = image.gray_299
+            else:
+                gray_u8 = self.preprocess(image)
             
             # Extract HOG features
-            features = hog(
-                gray,
-                orientations=9,
-                pixels_per_cell=(8, 8),
-                cells_per_block=(2, 2),
-                visualize=False
-            )
+            features = _HOG.compute(gray_u8).ravel()
             
             # Analyze feature distribution
             feature_variance = np.var(features)
@@ -0,0 +1,33 @@
+"""Batch prediction must run frames side by side, not queue behind _POOL."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from app.models import ensemble
+from app.models.ensemble import EnsembleDetector
+
+
+class _BarrierModel:
+    """Blocks until `parties` model calls are in flight at the same time."""
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+
+    def predict(self, prepared):
+        self.barrier.wait(timeout=5)
+        return {'score': 0.25, 'is_fake': False}
+
+
+def test_batch_runs_more_models_at_once_than_the_model_pool(monkeypatch):
+    workers = 8  # twice the 4-worker model pool
+    monkeypatch.setattr(ensemble, "_BATCH_POOL", ThreadPoolExecutor(max_workers=workers))
+    model = _BarrierModel(threading.Barrier(workers))
+    detector = EnsembleDetector(model, model, model, model)
+
+    frame = Image.fromarray(np.zeros((64, 64, 3), dtype=np.uint8), "RGB")
+    results = detector.predict_batch([frame] * workers)
+
+    assert [r.get('error') for r in results] == [None] * workers
+    assert all(r['ensemble_score'] == 0.25 for r in results)
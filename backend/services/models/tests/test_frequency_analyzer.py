@@ -0,0 +1,34 @@
+"""DCT scoring must not mistake float32 rounding noise for artifacts."""
+import numpy as np
+import pytest
+from scipy.fft import dctn
+
+from app.models.frequency_analyzer import FrequencyAnalyzer
+
+
+def _horizontal_gradient():
+    return np.tile(np.linspace(0, 255, 640).astype(np.uint8), (480, 1))
+
+
+def _vertical_gradient():
+    return np.tile(np.linspace(0, 255, 480).astype(np.uint8)[:, None], (1, 640))
+
+
+@pytest.mark.parametrize("make_image", [_horizontal_gradient, _vertical_gradient])
+def test_smooth_input_is_not_flagged_by_dct(make_image):
+    result = FrequencyAnalyzer().predict(make_image())
+
+    # No high-frequency energy: neutral, not maximal
+    assert result['dct_anomaly'] == 0.5
+    assert not result['is_fake']
+
+
+def test_textured_input_matches_float64_reference():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(480, 640), dtype=np.uint8)
+
+    dct = dctn(image.astype(np.float64), type=2, norm='ortho')
+    hf = np.abs(dct[240:, 320:])
+    expected = min(hf.std() / hf.mean() / 10, 1.0)
+
+    assert FrequencyAnalyzer().analyze_dct(image) == pytest.approx(expected, rel=1e-4)
@@ -0,0 +1,25 @@
+"""The CUDA preprocessing path must track the CPU resize rule."""
+import numpy as np
+import pytest
+
+from app.models.gpu_preprocess import CUDA_AVAILABLE, GpuPreprocessor
+from app.models.prepared import resize_square, to_gray_u8
+
+pytestmark = pytest.mark.skipif(not CUDA_AVAILABLE, reason="no CUDA device")
+
+
+# Enlarged, shrunk by a non-integer factor, and shrunk on one side only
+@pytest.mark.parametrize("size", [(100, 100), (700, 530), (200, 400)])
+def test_gpu_matches_cpu(size):
+    width, height = size
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+    resized = GpuPreprocessor().preprocess(rgb, (256, 299))
+
+    gray = to_gray_u8(rgb)
+    for side in (256, 299):
+        cpu = resize_square(gray, side).astype(np.int16)
+        gpu = resized[side].astype(np.int16)
+        # Float vs OpenCV fixed-point arithmetic: off by at most one level
+        assert np.abs(gpu - cpu).max() <= 1
@@ -0,0 +1,41 @@
+"""Model inputs must not depend on which route prepared the image."""
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.models.mesonet import MesoNet
+from app.models.prepared import prepare_image
+from app.models.xception import XceptionNet
+
+
+def _image(width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    return Image.fromarray(pixels, "RGB")
+
+
+# Enlarged, shrunk, and shrunk on one side only
+SIZES = [(100, 100), (1200, 900), (200, 400)]
+
+
+@pytest.mark.parametrize("model_cls", [MesoNet, XceptionNet])
+@pytest.mark.parametrize("size", SIZES)
+def test_pil_and_prepared_scores_match(model_cls, size):
+    model = model_cls()
+    image = _image(*size)
+
+    direct = model.predict(image)
+    prepared = model.predict(prepare_image(image))
+
+    assert "error" not in direct
+    assert direct["score"] == prepared["score"]
+    assert direct["is_fake"] == prepared["is_fake"]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_prepared_views_match_preprocess(size):
+    image = _image(*size)
+    prepared = prepare_image(image)
+
+    np.testing.assert_array_equal(prepared.gray_256, MesoNet().preprocess(image))
+    np.testing.assert_array_equal(prepared.gray_299, XceptionNet().preprocess(image))
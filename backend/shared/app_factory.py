@@ -0,0 +1,46 @@
+"""
+FastAPI application factory shared by all services.
+Keeps app defaults and CORS configuration in one place.
+"""
+from typing import Optional
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import os
+
+# Explicit lists (no "*") so credentialed preflights are plain lookups;
+# browsers cache the preflight result for CORS_MAX_AGE seconds
+ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
+CORS_METHODS = ["GET", "POST", "PUT", "DELETE"]
+CORS_HEADERS = ["Authorization", "Content-Type"]
+CORS_MAX_AGE = int(os.getenv("CORS_MAX_AGE", "86400"))
+
+
+def create_app(name: str, description: Optional[str] = None, version: str = "1.0.0", **kwargs) -> FastAPI:
+    """
+    Create a service app with the common defaults and CORS middleware.
+
+    Args:
+        name: Service name, e.g. "Auth Service" (title becomes "DeepTrust <name>")
+        description: OpenAPI description
+        version: Service version
+        **kwargs: Extra FastAPI arguments (e.g. docs_url)
+
+    Returns:
+        Configured FastAPI app
+    """
+    kwargs.setdefault("default_response_class", ORJSONResponse)
+    if description is not None:
+        kwargs["description"] = description
+
+    app = FastAPI(title=f"DeepTrust {name}", version=version, **kwargs)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=CORS_METHODS,
+        allow_headers=CORS_HEADERS,
+        max_age=CORS_MAX_AGE,
+    )
+    return app
@@ -0,0 +1,7 @@
+"""Shared authentication dependencies"""
+from .deps import get_current_user, bearer_scheme
+
+__all__ = [
+    'get_current_user',
+    'bearer_scheme'
+]
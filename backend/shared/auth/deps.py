@@ -0,0 +1,51 @@
+"""FastAPI dependencies for bearer-token authentication"""
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from typing import Optional
+import uuid
+
+from shared.database.base import get_db
+from shared.models import User
+from shared.utils import verify_token, token_cache
+
+# auto_error=False so a missing header is a 401 (HTTPBearer's default is 403)
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """Resolve the bearer token to an active user."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if credentials is None:
+        raise credentials_exception
+
+    token = credentials.credentials
+    try:
+        token_hash = token_cache.hash_token(token)
+    except UnicodeEncodeError:
+        raise credentials_exception
+
+    cached = token_cache.lookup(token_hash)
+    if cached is not None:
+        _, user_snapshot = cached
+        return db.merge(User.from_snapshot(user_snapshot), load=False)
+
+    try:
+        payload = verify_token(token, token_hash)
+        user_id = uuid.UUID(payload.get("user_id"))
+    except Exception:
+        raise credentials_exception
+
+    user = db.get(User, user_id)
+    if not user or not user.is_active:
+        raise credentials_exception
+
+    token_cache.store(token_hash, payload, user.snapshot())
+    return user
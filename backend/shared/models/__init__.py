@@ -1,10 +1,10 @@
 """Shared database models"""
-from .user import User, UserRole
+from .user import User, UserRole, ROLE_VALUES
 from .analysis import Analysis, AnalysisStatus
 from .analysis_result import AnalysisResult
 
 __all__ = [
-    'User', 'UserRole',
+    'User', 'UserRole', 'ROLE_VALUES',
     'Analysis', 'AnalysisStatus',
     'AnalysisResult'
 ]
@@ -1,12 +1,12 @@
 """User model - shared across all services."""
-from sqlalchemy import Column, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Index, inspect, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, make_transient_to_detached
 from datetime import datetime
-import uuid
 import enum
 
 from shared.database.base import Base
+from shared.schemas.user_schemas import USER_RESPONSE_ADAPTER
 
 
 class UserRole(str, enum.Enum):
@@ -15,16 +15,27 @@ class UserRole(str, enum.Enum):
     ADMIN = "admin"
 
 
+# Plain string per role, for hot paths that would otherwise go through .value
+ROLE_VALUES = {role: role.value for role in UserRole}
+
+
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Active users by role; replaces separate role and is_active indexes
+        Index("ix_users_active_role", "role", postgresql_where=text("is_active = true")),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False, index=True)
-    username = Column(String(50), unique=True, nullable=False, index=True)
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    # Generated by Postgres (pgcrypto, see infrastructure/docker/postgres/init.sql)
+    # and returned with the INSERT
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), nullable=False)
+    # unique=True already backs these with an index
+    username = Column(String(50), unique=True, nullable=False)
+    email = Column(String(255), unique=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(100), nullable=True)
-    role = Column(Enum(UserRole), default=UserRole.USER, nullable=False, index=True)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
     is_verified = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -33,26 +44,32 @@ class User(Base):
     analyses = relationship("Analysis", back_populates="user", cascade="all, delete-orphan")
 
     def __repr__(self):
-        return f"<User {self.username} ({self.email}) - {self.role.value}>"
+        return f"<User {self.username} ({self.email}) - {ROLE_VALUES[self.role]}>"
 
     def to_dict(self):
-        return {
-            "id": str(self.id),
-            "username": self.username,
-            "email": self.email,
-            "full_name": self.full_name,
-            "role": self.role.value,
-            "is_active": self.is_active,
-            "is_verified": self.is_verified,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "last_login": self.last_login.isoformat() if self.last_login else None
-        }
+        """JSON-ready dict in the UserResponse shape, built by pydantic-core"""
+        return USER_RESPONSE_ADAPTER.dump_python(self, mode="json")
+
+    def snapshot(self):
+        """Column values as a plain dict, safe to keep across sessions."""
+        return {attr.key: getattr(self, attr.key) for attr in inspect(User).column_attrs}
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """Rebuild a detached instance from snapshot() without a query.
+
+        Attach it with `db.merge(user, load=False)`.
+        """
+        user = cls(**data)
+        make_transient_to_detached(user)
+        return user
 
     @property
     def is_admin(self):
-        return self.role == UserRole.ADMIN
+        # Enum members are singletons; identity avoids str/Enum __eq__
+        return self.role is UserRole.ADMIN
 
     @property
     def is_analyst(self):
-        return self.role in [UserRole.ANALYST, UserRole.ADMIN]
\ No newline at end of file
+        role = self.role
+        return role is UserRole.ANALYST or role is UserRole.ADMIN
\ No newline at end of file
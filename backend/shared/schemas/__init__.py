@@ -1,12 +1,14 @@
 """Shared Pydantic schemas"""
 from .user_schemas import (
     UserRegister, UserLogin, UserUpdate, UserResponse,
-    PasswordChange, Token, TokenData, UserRole
+    PasswordChange, Token, TokenData, UserRole,
+    USER_RESPONSE_ADAPTER, USER_LIST_ADAPTER, TOKEN_ADAPTER
 )
 from .common_schemas import MessageResponse, ErrorResponse, HealthResponse
 
 __all__ = [
     'UserRegister', 'UserLogin', 'UserUpdate', 'UserResponse',
     'PasswordChange', 'Token', 'TokenData', 'UserRole',
+    'USER_RESPONSE_ADAPTER', 'USER_LIST_ADAPTER', 'TOKEN_ADAPTER',
     'MessageResponse', 'ErrorResponse', 'HealthResponse'
 ]
\ No newline at end of file
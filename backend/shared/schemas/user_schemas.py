@@ -1,13 +1,62 @@
 """
 User-related Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional
+from pydantic import (
+    AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+)
+from typing import Annotated, List, Optional
 from datetime import datetime
 from enum import Enum
 import uuid
 
 
+_HAS_UPPER, _HAS_LOWER, _HAS_DIGIT = 1, 2, 4
+_HAS_ALL = _HAS_UPPER | _HAS_LOWER | _HAS_DIGIT
+
+
+def _check_password_rules(v: str) -> str:
+    """Length and character-class rules, checked in a single pass"""
+    if len(v) < 8:
+        raise ValueError('Password must be at least 8 characters')
+
+    flags = 0
+    for c in v:
+        if c.isupper():
+            flags |= _HAS_UPPER
+        elif c.islower():
+            flags |= _HAS_LOWER
+        elif c.isdigit():
+            flags |= _HAS_DIGIT
+        else:
+            continue
+        if flags == _HAS_ALL:
+            return v
+
+    if not flags & _HAS_UPPER:
+        raise ValueError('Must contain uppercase letter')
+    if not flags & _HAS_LOWER:
+        raise ValueError('Must contain lowercase letter')
+    raise ValueError('Must contain digit')
+
+
+# One password type (and validator) shared by every schema that sets a password
+StrongPassword = Annotated[
+    str,
+    Field(min_length=8, max_length=100),
+    AfterValidator(_check_password_rules)
+]
+
+
+# Syntax-only email check, compiled once by pydantic-core (no email-validator
+# deliverability work per request). Lower-cased so the unique constraint on
+# users.email treats Foo@Example.com and foo@example.com as one address
+Email = Annotated[
+    str,
+    Field(pattern=r"^[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}$", max_length=255),
+    AfterValidator(str.lower)
+]
+
+
 class UserRole(str, Enum):
     USER = "user"
     ANALYST = "analyst"
@@ -17,8 +66,8 @@ class UserRole(str, Enum):
 class UserRegister(BaseModel):
     """User registration schema"""
     username: str = Field(..., min_length=3, max_length=50)
-    email: EmailStr
-    password: str = Field(..., min_length=8, max_length=100)
+    email: Email
+    password: StrongPassword
     full_name: Optional[str] = Field(None, max_length=100)
 
     @field_validator('username')
@@ -29,19 +78,6 @@ class UserRegister(BaseModel):
             raise ValueError('Username must be alphanumeric')
         return v
 
-    @field_validator('password')
-    @classmethod
-    def password_strength(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Must contain uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Must contain lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Must contain digit')
-        return v
-
 
 class UserLogin(BaseModel):
     """Login schema"""
@@ -51,27 +87,14 @@ class UserLogin(BaseModel):
 
 class UserUpdate(BaseModel):
     """Profile update schema"""
-    email: Optional[EmailStr] = None
+    email: Optional[Email] = None
     full_name: Optional[str] = Field(None, max_length=100)
 
 
 class PasswordChange(BaseModel):
     """Password change schema"""
     current_password: str
-    new_password: str = Field(..., min_length=8)
-
-    @field_validator('new_password')
-    @classmethod
-    def password_strength(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Must contain uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Must contain lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Must contain digit')
-        return v
+    new_password: StrongPassword
 
 
 class UserResponse(BaseModel):
@@ -87,10 +110,8 @@ class UserResponse(BaseModel):
     updated_at: datetime
     last_login: Optional[datetime]
 
-    model_config = {
-        "from_attributes": True,
-        "json_encoders": {uuid.UUID: str}
-    }
+    # UUIDs serialize natively in pydantic-core; no Python json_encoders hook
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -106,4 +127,10 @@ class TokenData(BaseModel):
     user_id: str
     username: str
     role: UserRole
-    exp: Optional[datetime] = None
\ No newline at end of file
+    exp: Optional[datetime] = None
+
+
+# Prebuilt validators/serializers for the hot response paths
+USER_RESPONSE_ADAPTER = TypeAdapter(UserResponse)
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+TOKEN_ADAPTER = TypeAdapter(Token)
@@ -1,8 +1,13 @@
 """Shared utilities"""
-from .password_utils import hash_password, verify_password, needs_rehash
+from .password_utils import (
+    hash_password, verify_password, needs_rehash, ahash_password, averify_password
+)
 from .jwt_utils import create_access_token, verify_token, decode_token
+from .logging_utils import start_queue_logging, stop_queue_logging
 
 __all__ = [
     'hash_password', 'verify_password', 'needs_rehash',
-    'create_access_token', 'verify_token', 'decode_token'
+    'ahash_password', 'averify_password',
+    'create_access_token', 'verify_token', 'decode_token',
+    'start_queue_logging', 'stop_queue_logging'
 ]
\ No newline at end of file
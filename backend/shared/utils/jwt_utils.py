@@ -1,61 +1,179 @@
 """JWT token utilities"""
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from cachetools import TTLCache
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, hmac
+from jwt import DecodeError, InvalidTokenError as JWTError
+from jwt.algorithms import HMACAlgorithm
 from fastapi import HTTPException, status
+import hashlib
+import jwt
+import orjson
+import threading
+import time
 import os
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev_secret_key_change_in_production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+_ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Per-call setup hoisted out of encode/decode
+_SECRET_BYTES = SECRET_KEY.encode("utf-8")
+_ALGS = [ALGORITHM]
+_DECODE_OPTIONS = {"require": ["exp", "iat"]}
+
+
+class _OpenSSLHS256(HMACAlgorithm):
+    """HS256 computed and compared inside OpenSSL via cryptography"""
+    
+    def __init__(self):
+        super().__init__(HMACAlgorithm.SHA256)
+        # Keyed context for our own secret; copying it skips the key schedule
+        self._template = hmac.HMAC(_SECRET_BYTES, hashes.SHA256())
+    
+    def _context(self, key: bytes) -> hmac.HMAC:
+        if key == _SECRET_BYTES:
+            return self._template.copy()
+        return hmac.HMAC(key, hashes.SHA256())
+    
+    def sign(self, msg: bytes, key: bytes) -> bytes:
+        h = self._context(key)
+        h.update(msg)
+        return h.finalize()
+    
+    def verify(self, msg: bytes, key: bytes, sig: bytes) -> bool:
+        h = self._context(key)
+        h.update(msg)
+        try:
+            h.verify(sig)
+            return True
+        except InvalidSignature:
+            return False
+
+
+# Private JWS instance carrying the OpenSSL HS256; PyJWT's process-wide
+# default registry (used by jwt.encode/decode elsewhere) is left untouched
+_jws = jwt.PyJWS(algorithms=_ALGS)
+_jws.unregister_algorithm(ALGORITHM)
+_jws.register_algorithm(ALGORITHM, _OpenSSLHS256())
+
+
+class _OrjsonJWT(jwt.PyJWT):
+    """
+    PyJWT signing/verifying through the private _jws, with the claims set
+    encoded/decoded by orjson.
+    
+    PyJWT.encode/decode_complete always call the module-level JWS, so the
+    two entry points used here are reimplemented on top of _jws; claim
+    validation is PyJWT's own.
+    """
+    
+    def encode(self, payload: Dict[str, Any], key: bytes, algorithm: str = ALGORITHM) -> str:
+        return _jws.encode(self._encode_payload(payload), key, algorithm)
+    
+    def decode(
+        self,
+        token: str,
+        key: bytes = b"",
+        algorithms: Optional[list] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        options = dict(options or {})
+        options.setdefault("verify_signature", True)
+        if not options["verify_signature"]:
+            for claim in ("exp", "nbf", "iat", "aud", "iss"):
+                options.setdefault(f"verify_{claim}", False)
+        
+        decoded = _jws.decode_complete(token, key=key, algorithms=algorithms, options=options)
+        payload = self._decode_payload(decoded)
+        self._validate_claims(payload, {**self.options, **options})
+        return payload
+    
+    def _encode_payload(self, payload, headers=None, json_encoder=None) -> bytes:
+        # Our claims are plain str/int values; json_encoder is not needed
+        return orjson.dumps(payload)
+    
+    def _decode_payload(self, decoded):
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise DecodeError(f"Invalid payload string: {e}")
+        if not isinstance(payload, dict):
+            raise DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+_jwt = _OrjsonJWT()
+
+# Verified payloads keyed by token digest; entries are also checked against exp
+_VERIFY_CACHE = TTLCache(maxsize=10000, ttl=60)
+_verify_lock = threading.Lock()
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
     
+    # NumericDate claims as plain epoch seconds
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + _ACCESS_TOKEN_EXPIRE_SECONDS
     
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
+        "iat": now,
         "type": "access"
     })
     
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return _jwt.encode(to_encode, _SECRET_BYTES, algorithm=ALGORITHM)
 
 
-def verify_token(token: str) -> Dict[str, Any]:
-    """Verify and decode JWT token"""
+def verify_token(token: str, token_hash: Optional[bytes] = None) -> Dict[str, Any]:
+    """
+    Verify and decode JWT token.
+    
+    Pass token_hash (SHA-256 of the token) if the caller already has it.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    if token_hash is None:
+        token_hash = hashlib.sha256(token.encode()).digest()
+    
+    with _verify_lock:
+        cached = _VERIFY_CACHE.get(token_hash)
+    if cached is not None and cached["exp"] > time.time():
+        return cached
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("user_id")
-        username: str = payload.get("username")
-        
-        if user_id is None or username is None:
-            raise credentials_exception
-        
-        return payload
+        payload = _jwt.decode(token, _SECRET_BYTES, algorithms=_ALGS, options=_DECODE_OPTIONS)
     except JWTError:
         raise credentials_exception
+    
+    # Check both claims before deciding, so a bad payload fails the same
+    # way (and on the same path) as a bad signature
+    valid = bool(payload.get("user_id")) & bool(payload.get("username"))
+    if not valid:
+        raise credentials_exception
+    
+    with _verify_lock:
+        _VERIFY_CACHE[token_hash] = payload
+    return payload
 
 
 def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """Decode token without verification (debugging only)"""
     try:
-        payload = jwt.decode(
+        payload = _jwt.decode(
             token,
-            SECRET_KEY,
-            algorithms=[ALGORITHM],
+            algorithms=_ALGS,
             options={"verify_signature": False}
         )
         return payload
@@ -0,0 +1,44 @@
+"""Non-blocking logging setup"""
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+import logging
+import queue
+
+_listener: Optional[QueueListener] = None
+_root_handlers: List[logging.Handler] = []
+
+
+def start_queue_logging(level: int = logging.INFO) -> None:
+    """
+    Route root logging through a queue.
+
+    Request handlers only enqueue records; the existing root handlers
+    (or a StreamHandler if none are configured) run on a background thread.
+    """
+    global _listener, _root_handlers
+
+    if _listener is not None:
+        return
+
+    root = logging.getLogger()
+    _root_handlers = list(root.handlers)
+    handlers = _root_handlers or [logging.StreamHandler()]
+
+    log_queue = queue.SimpleQueue()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_queue_logging() -> None:
+    """Flush queued records and restore the original root handlers"""
+    global _listener
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    logging.getLogger().handlers = _root_handlers
+    _listener = None
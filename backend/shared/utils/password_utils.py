@@ -1,11 +1,30 @@
 """Password hashing utilities"""
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
+from typing import Dict, Optional
+import asyncio
+import os
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
+# New hashes use Argon2id (OWASP: 64 MiB, t=3, p=2); existing bcrypt hashes
+# still verify and report needs_rehash so they upgrade on next login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=65536,
+    argon2__time_cost=3,
+    argon2__parallelism=2,
+    bcrypt__rounds=10
+)
+
+# argon2-cffi and bcrypt release the GIL, so hashes run in parallel here
+# instead of blocking the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 4)))
+_hash_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password")
 
 
 def hash_password(password: str) -> str:
-    """Hash password with bcrypt"""
+    """Hash password with Argon2id"""
     return pwd_context.hash(password)
 
 
@@ -17,6 +36,44 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+# needs_update depends only on scheme + cost settings, so cache it per prefix
+_NEEDS_UPDATE_CACHE_SIZE = 64
+_needs_update_cache: Dict[str, bool] = {}
+
+
+def _settings_prefix(hashed_password: str) -> Optional[str]:
+    """Hash prefix holding scheme and cost settings, without salt/checksum"""
+    if hashed_password.startswith("$argon2"):
+        # $argon2id$v=19$m=...,t=...,p=...$<salt>$<checksum>
+        parts = hashed_password.split("$")
+        return "$".join(parts[:-2]) if len(parts) == 6 else None
+    if hashed_password.startswith("$2"):
+        # $2b$<rounds>$<salt+checksum>
+        return hashed_password[:hashed_password.rfind("$") + 1]
+    return None
+
+
 def needs_rehash(hashed_password: str) -> bool:
     """Check if hash needs upgrade"""
-    return pwd_context.needs_update(hashed_password)
\ No newline at end of file
+    prefix = _settings_prefix(hashed_password)
+    if prefix is None:
+        return pwd_context.needs_update(hashed_password)
+    
+    result = _needs_update_cache.get(prefix)
+    if result is None:
+        result = pwd_context.needs_update(hashed_password)
+        if len(_needs_update_cache) < _NEEDS_UPDATE_CACHE_SIZE:
+            _needs_update_cache[prefix] = result
+    return result
+
+
+async def ahash_password(password: str) -> str:
+    """Hash password on the password worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, hash_password, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify password on the password worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool, verify_password, plain_password, hashed_password)
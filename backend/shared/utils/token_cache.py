@@ -0,0 +1,85 @@
+"""
+In-process cache of verified bearer tokens.
+
+Lets get_current_user skip JWT verification and the user lookup for tokens
+seen recently. Entries are keyed by a SHA-256 digest of the token (the raw
+token is never stored) and never outlive the token's own `exp` claim.
+"""
+from cachetools import TTLCache
+from typing import Optional, Dict, Any, Set, Tuple
+import hashlib
+import threading
+import time
+import os
+
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "30"))
+TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", "10000"))
+
+_cache = TTLCache(maxsize=TOKEN_CACHE_MAXSIZE, ttl=TOKEN_CACHE_TTL)
+_user_keys: Dict[str, Set[bytes]] = {}
+_lock = threading.Lock()
+
+
+def hash_token(token: str) -> bytes:
+    """SHA-256 digest identifying a token; compute once per request"""
+    return hashlib.sha256(token.encode("ascii")).digest()
+
+
+def lookup(token_hash: bytes) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Return (payload, user_snapshot) for a cached token, or None"""
+    with _lock:
+        entry = _cache.get(token_hash)
+        if entry is None:
+            return None
+
+        payload, user_snapshot, expires_at = entry
+        if expires_at <= time.time():
+            _cache.pop(token_hash, None)
+            return None
+
+    return payload, user_snapshot
+
+
+def store(token_hash: bytes, payload: Dict[str, Any], user_snapshot: Dict[str, Any]):
+    """Cache a verified token until min(exp, now + TTL)"""
+    now = time.time()
+    expires_at = min(float(payload.get("exp", now)), now + TOKEN_CACHE_TTL)
+    if expires_at <= now:
+        return
+
+    user_id = str(user_snapshot["id"])
+
+    with _lock:
+        _cache[token_hash] = (payload, user_snapshot, expires_at)
+
+        # Drop index entries the TTL cache has already evicted
+        keys = {k for k in _user_keys.get(user_id, ()) if k in _cache}
+        keys.add(token_hash)
+        _user_keys[user_id] = keys
+
+        if len(_user_keys) > _cache.maxsize:
+            _prune_index()
+
+
+def clear_user(user_id) -> None:
+    """Invalidate every cached token belonging to a user"""
+    with _lock:
+        for key in _user_keys.pop(str(user_id), ()):
+            _cache.pop(key, None)
+
+
+def clear() -> None:
+    """Invalidate all cached tokens"""
+    with _lock:
+        _cache.clear()
+        _user_keys.clear()
+
+
+def _prune_index():
+    """Remove users whose tokens have all been evicted (caller holds lock)"""
+    for user_id in list(_user_keys):
+        keys = {k for k in _user_keys[user_id] if k in _cache}
+        if keys:
+            _user_keys[user_id] = keys
+        else:
+            del _user_keys[user_id]